@@ -310,6 +310,16 @@ else:
     except Exception:
         DATABASE_POOL_RECYCLE = 3600
 
+DATABASE_QUERY_CACHE_SIZE = os.environ.get("DATABASE_QUERY_CACHE_SIZE", 1200)
+
+if DATABASE_QUERY_CACHE_SIZE == "":
+    DATABASE_QUERY_CACHE_SIZE = 1200
+else:
+    try:
+        DATABASE_QUERY_CACHE_SIZE = int(DATABASE_QUERY_CACHE_SIZE)
+    except Exception:
+        DATABASE_QUERY_CACHE_SIZE = 1200
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -460,3 +470,18 @@ OTEL_TRACES_SAMPLER = os.environ.get(
 
 PIP_OPTIONS = os.getenv("PIP_OPTIONS", "").split()
 PIP_PACKAGE_INDEX_OPTIONS = os.getenv("PIP_PACKAGE_INDEX_OPTIONS", "").split()
+
+####################################
+# FUNCTIONS
+####################################
+
+# Seconds to reuse the model list returned by a manifold pipe's `pipes`
+PIPE_MODELS_CACHE_TTL = os.environ.get("PIPE_MODELS_CACHE_TTL", 60)
+
+if PIPE_MODELS_CACHE_TTL == "":
+    PIPE_MODELS_CACHE_TTL = 60
+else:
+    try:
+        PIPE_MODELS_CACHE_TTL = int(PIPE_MODELS_CACHE_TTL)
+    except Exception:
+        PIPE_MODELS_CACHE_TTL = 60
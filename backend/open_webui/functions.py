@@ -1,22 +1,15 @@
 import logging
 import sys
 import inspect
-import json
+import orjson
 import asyncio
+import time
+from collections import ChainMap
 
 from pydantic import BaseModel
-from typing import AsyncGenerator, Generator, Iterator
-from fastapi import (
-    Depends,
-    FastAPI,
-    File,
-    Form,
-    HTTPException,
-    Request,
-    UploadFile,
-    status,
-)
-from starlette.responses import Response, StreamingResponse
+from typing import AsyncGenerator, Generator, Optional
+from fastapi import Request
+from starlette.responses import StreamingResponse
 
 
 from open_webui.socket.main import (
@@ -29,15 +22,10 @@ from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 
 from open_webui.utils.plugin import load_function_module_by_id
-from open_webui.utils.tools import get_tools
-from open_webui.utils.access_control import has_access
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL, PIPE_MODELS_CACHE_TTL
 
 from open_webui.utils.misc import (
-    add_or_update_system_message,
-    get_last_user_message,
-    prepend_to_first_user_message_content,
     openai_chat_chunk_message_template,
     openai_chat_completion_message_template,
 )
@@ -51,8 +39,64 @@ logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Pre-encoded server-sent event framing for streamed pipe responses
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]"
+
+# Number of chunks buffered ahead of the client when forwarding pipe streams
+STREAM_PREFETCH_SIZE = 16
+
+
+async def prefetch_async_iterator(iterator, maxsize: int = STREAM_PREFETCH_SIZE):
+    """
+    Drain an async iterator in a background task into a bounded queue so the
+    producer can keep working while the previous chunk is being sent.
+    """
+    queue = asyncio.Queue(maxsize=maxsize)
+    done = object()
+    closing = False
+
+    async def produce():
+        try:
+            async for item in iterator:
+                await queue.put((item, None))
+        except BaseException as e:
+            if closing:
+                # Cancelled by the consumer below, nobody reads the queue
+                raise
+            # Hand every failure, CancelledError included, to the consumer
+            # so it never waits on a sentinel that will not come
+            await queue.put((done, e))
+        else:
+            await queue.put((done, None))
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                break
+            yield item
+    finally:
+        # Stop the producer and finalise the source, e.g. on client disconnect
+        closing = True
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
 
-def get_function_module_by_id(request: Request, pipe_id: str):
+def get_function_module_by_id(
+    request: Request, pipe_id: str, valves: Optional[dict] = None
+):
     # Check if function is already loaded
     if pipe_id not in request.app.state.FUNCTIONS:
         function_module, _, _ = load_function_module_by_id(pipe_id)
@@ -60,40 +104,100 @@ def get_function_module_by_id(request: Request, pipe_id: str):
     else:
         function_module = request.app.state.FUNCTIONS[pipe_id]
 
-    if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(pipe_id)
-        function_module.valves = function_module.Valves(**(valves if valves else {}))
+    # Cache capability flags and signature lookups on the module itself so
+    # they are dropped automatically whenever the module is reloaded
+    if not hasattr(function_module, "_has_valves"):
+        function_module._has_valves = hasattr(function_module, "valves") and hasattr(
+            function_module, "Valves"
+        )
+        function_module._has_user_valves = hasattr(function_module, "UserValves")
+        if hasattr(function_module, "pipe"):
+            function_module._pipe_param_names = frozenset(
+                inspect.signature(function_module.pipe).parameters
+            )
+
+    if function_module._has_valves:
+        if valves is None:
+            valves = Functions.get_function_valves_by_id(pipe_id)
+        valves = valves if valves else {}
+
+        # Only rebuild the Valves model when the stored values have changed
+        if getattr(function_module, "_valves_source", None) != valves:
+            function_module.valves = function_module.Valves(**valves)
+            function_module._valves_source = valves
     return function_module
 
 
-async def get_function_models(request):
-    pipes = Functions.get_functions_by_type("pipe", active_only=True)
-    pipe_models = []
+async def load_active_pipe_modules(app):
+    """
+    Load the modules of all active pipes in the background at startup so the
+    first request to each pipe does not pay for exec'ing its source.
+    """
+    try:
+        pipes = Functions.get_functions_by_type("pipe", active_only=True)
+    except Exception as e:
+        log.exception(f"Error listing pipe modules: {e}")
+        return
 
     for pipe in pipes:
-        function_module = get_function_module_by_id(request, pipe.id)
+        # Load on the event loop like the request path does, since pipes may
+        # expect a running loop in their constructors; yield between modules
+        await asyncio.sleep(0)
+        if pipe.id in app.state.FUNCTIONS:
+            continue
+
+        try:
+            function_module, _, _ = load_function_module_by_id(pipe.id)
+            app.state.FUNCTIONS[pipe.id] = function_module
+        except Exception as e:
+            log.exception(f"Error loading pipe module {pipe.id}: {e}")
+
+
+async def get_function_models(request):
+    async def get_pipe_models(pipe, valves) -> list[dict]:
+        function_module = get_function_module_by_id(request, pipe.id, valves)
 
         # Check if function is a manifold
         if hasattr(function_module, "pipes"):
             sub_pipes = []
 
-            # Handle pipes being a list, sync function, or async function
-            try:
-                if callable(function_module.pipes):
-                    if asyncio.iscoroutinefunction(function_module.pipes):
-                        sub_pipes = await function_module.pipes()
+            # Reuse the sub pipes listed within the TTL as long as the valves,
+            # which usually carry the upstream connection details, are unchanged
+            current_valves = getattr(function_module, "valves", None)
+            cached = getattr(function_module, "_sub_pipes_cache", None)
+            now = time.monotonic()
+
+            if (
+                cached is not None
+                and cached[1] is current_valves
+                and now - cached[0] < PIPE_MODELS_CACHE_TTL
+            ):
+                sub_pipes = cached[2]
+            else:
+                # Handle pipes being a list, sync function, or async function
+                try:
+                    if callable(function_module.pipes):
+                        if asyncio.iscoroutinefunction(function_module.pipes):
+                            sub_pipes = await function_module.pipes()
+                        else:
+                            sub_pipes = await asyncio.to_thread(function_module.pipes)
                     else:
-                        sub_pipes = function_module.pipes()
-                else:
-                    sub_pipes = function_module.pipes
-            except Exception as e:
-                log.exception(e)
-                sub_pipes = []
+                        sub_pipes = function_module.pipes
+
+                    function_module._sub_pipes_cache = (
+                        now,
+                        current_valves,
+                        sub_pipes,
+                    )
+                except Exception as e:
+                    log.exception(e)
+                    sub_pipes = []
 
             log.debug(
                 f"get_function_models: function '{pipe.id}' is a manifold of {sub_pipes}"
             )
 
+            models = []
             for p in sub_pipes:
                 sub_pipe_id = f'{pipe.id}.{p["id"]}'
                 sub_pipe_name = p["name"]
@@ -103,7 +207,7 @@ async def get_function_models(request):
 
                 pipe_flag = {"type": pipe.type}
 
-                pipe_models.append(
+                models.append(
                     {
                         "id": sub_pipe_id,
                         "name": sub_pipe_name,
@@ -113,6 +217,7 @@ async def get_function_models(request):
                         "pipe": pipe_flag,
                     }
                 )
+            return models
         else:
             pipe_flag = {"type": "pipe"}
 
@@ -120,7 +225,7 @@ async def get_function_models(request):
                 f"get_function_models: function '{pipe.id}' is a single pipe {{ 'id': {pipe.id}, 'name': {pipe.name} }}"
             )
 
-            pipe_models.append(
+            return [
                 {
                     "id": pipe.id,
                     "name": pipe.name,
@@ -129,7 +234,20 @@ async def get_function_models(request):
                     "owned_by": "openai",
                     "pipe": pipe_flag,
                 }
-            )
+            ]
+
+    # Fetch the valves alongside the pipes to avoid a query per pipe
+    pipes = Functions.get_functions_with_valves_by_type("pipe", active_only=True)
+
+    # List manifold sub pipes concurrently; module loading itself is
+    # synchronous, so each pipe is still loaded exactly once
+    results = await asyncio.gather(
+        *(get_pipe_models(pipe, valves) for pipe, valves in pipes)
+    )
+
+    pipe_models = []
+    for models in results:
+        pipe_models.extend(models)
 
     return pipe_models
 
@@ -146,28 +264,29 @@ async def generate_function_chat_completion(
     async def get_message_content(res: str | Generator | AsyncGenerator) -> str:
         if isinstance(res, str):
             return res
-        if isinstance(res, Generator):
-            return "".join(map(str, res))
-        if isinstance(res, AsyncGenerator):
+        if hasattr(res, "__anext__"):
             return "".join([str(stream) async for stream in res])
+        if hasattr(res, "__next__"):
+            return "".join(map(str, res))
 
     def process_line(form_data: dict, line):
         if isinstance(line, BaseModel):
-            line = line.model_dump_json()
-            line = f"data: {line}"
+            # The model's own compiled serializer, straight to bytes
+            payload = line.__pydantic_serializer__.to_json(line)
+            return _SSE_PREFIX + payload + _SSE_SUFFIX
         if isinstance(line, dict):
-            line = f"data: {json.dumps(line)}"
+            return _SSE_PREFIX + orjson.dumps(line) + _SSE_SUFFIX
 
-        try:
+        if isinstance(line, (bytes, bytearray)):
+            if line.startswith(b"data:"):
+                return bytes(line) + _SSE_SUFFIX
             line = line.decode("utf-8")
-        except Exception:
-            pass
 
         if line.startswith("data:"):
-            return f"{line}\n\n"
+            return line.encode("utf-8") + _SSE_SUFFIX
         else:
             line = openai_chat_chunk_message_template(form_data["model"], line)
-            return f"data: {json.dumps(line)}\n\n"
+            return _SSE_PREFIX + orjson.dumps(line) + _SSE_SUFFIX
 
     def get_pipe_id(form_data: dict) -> str:
         pipe_id = form_data["model"]
@@ -181,13 +300,14 @@ async def generate_function_chat_completion(
 
         pipe_id = get_pipe_id(form_data)
 
-        # Get the signature of the function
-        sig = inspect.signature(function_module.pipe)
-        params = {"body": form_data} | {
-            k: v for k, v in extra_params.items() if k in sig.parameters
-        }
+        params = {"body": form_data}
+        params.update(
+            (k, extra_params[k])
+            for k in function_module._pipe_param_names
+            if k in extra_params
+        )
 
-        if "__user__" in params and hasattr(function_module, "UserValves"):
+        if "__user__" in params and function_module._has_user_valves:
             user_valves = Functions.get_user_valves_by_id_and_user_id(pipe_id, user.id)
             try:
                 params["__user__"]["valves"] = function_module.UserValves(**user_valves)
@@ -202,30 +322,28 @@ async def generate_function_chat_completion(
 
     metadata = form_data.pop("metadata", {})
 
-    files = metadata.get("files", [])
-    tool_ids = metadata.get("tool_ids", [])
-    # Check if tool_ids is None
-    if tool_ids is None:
-        tool_ids = []
+    files = metadata.get("files") or []
+    tool_ids = metadata.get("tool_ids") or []
+
+    chat_id = metadata.get("chat_id")
+    session_id = metadata.get("session_id")
+    message_id = metadata.get("message_id")
+    __task__ = metadata.get("task")
+    __task_body__ = metadata.get("task_body")
 
     __event_emitter__ = None
     __event_call__ = None
-    __task__ = None
-    __task_body__ = None
 
-    if metadata:
-        if all(k in metadata for k in ("session_id", "chat_id", "message_id")):
-            __event_emitter__ = get_event_emitter(metadata)
-            __event_call__ = get_event_call(metadata)
-        __task__ = metadata.get("task", None)
-        __task_body__ = metadata.get("task_body", None)
+    if "session_id" in metadata and "chat_id" in metadata and "message_id" in metadata:
+        __event_emitter__ = get_event_emitter(metadata)
+        __event_call__ = get_event_call(metadata)
 
     extra_params = {
         "__event_emitter__": __event_emitter__,
         "__event_call__": __event_call__,
-        "__chat_id__": metadata.get("chat_id", None),
-        "__session_id__": metadata.get("session_id", None),
-        "__message_id__": metadata.get("message_id", None),
+        "__chat_id__": chat_id,
+        "__session_id__": session_id,
+        "__message_id__": message_id,
         "__task__": __task__,
         "__task_body__": __task_body__,
         "__files__": files,
@@ -238,17 +356,26 @@ async def generate_function_chat_completion(
         "__metadata__": metadata,
         "__request__": request,
     }
-    extra_params["__tools__"] = get_tools(
-        request,
-        tool_ids,
-        user,
-        {
-            **extra_params,
-            "__model__": models.get(form_data["model"], None),
-            "__messages__": form_data["messages"],
-            "__files__": files,
-        },
-    )
+    extra_params["__tools__"] = {}
+    if tool_ids:
+        # Deferred so importing this module does not pull in the tools machinery
+        from open_webui.utils.tools import get_tools
+
+        extra_params["__tools__"] = get_tools(
+            request,
+            tool_ids,
+            user,
+            # Layer the tool-only params over extra_params instead of copying
+            # it; writes made by get_tools land in the front mapping
+            ChainMap(
+                {
+                    "__model__": models.get(form_data["model"], None),
+                    "__messages__": form_data["messages"],
+                    "__files__": files,
+                },
+                extra_params,
+            ),
+        )
 
     if model_info:
         if model_info.base_model_id:
@@ -272,37 +399,44 @@ async def generate_function_chat_completion(
 
                 # Directly return if the response is a StreamingResponse
                 if isinstance(res, StreamingResponse):
-                    async for data in res.body_iterator:
+                    async for data in prefetch_async_iterator(res.body_iterator):
                         yield data
                     return
                 if isinstance(res, dict):
-                    yield f"data: {json.dumps(res)}\n\n"
+                    yield _SSE_PREFIX + orjson.dumps(res) + _SSE_SUFFIX
                     return
 
             except Exception as e:
                 log.error(f"Error: {e}")
-                yield f"data: {json.dumps({'error': {'detail':str(e)}})}\n\n"
+                yield (
+                    _SSE_PREFIX
+                    + orjson.dumps({"error": {"detail": str(e)}})
+                    + _SSE_SUFFIX
+                )
                 return
 
+            # Dispatch on the result type once instead of probing it per chunk
+            needs_finish_message = isinstance(res, str) or (
+                hasattr(res, "__next__") and hasattr(res, "send")
+            )
+
             if isinstance(res, str):
                 message = openai_chat_chunk_message_template(form_data["model"], res)
-                yield f"data: {json.dumps(message)}\n\n"
-
-            if isinstance(res, Iterator):
-                for line in res:
+                yield _SSE_PREFIX + orjson.dumps(message) + _SSE_SUFFIX
+            elif hasattr(res, "__anext__"):
+                async for line in prefetch_async_iterator(res):
                     yield process_line(form_data, line)
-
-            if isinstance(res, AsyncGenerator):
-                async for line in res:
+            elif hasattr(res, "__next__"):
+                for line in res:
                     yield process_line(form_data, line)
 
-            if isinstance(res, str) or isinstance(res, Generator):
+            if needs_finish_message:
                 finish_message = openai_chat_chunk_message_template(
                     form_data["model"], ""
                 )
                 finish_message["choices"][0]["finish_reason"] = "stop"
-                yield f"data: {json.dumps(finish_message)}\n\n"
-                yield "data: [DONE]"
+                yield _SSE_PREFIX + orjson.dumps(finish_message) + _SSE_SUFFIX
+                yield _SSE_DONE
 
         return StreamingResponse(stream_content(), media_type="text/event-stream")
     else:
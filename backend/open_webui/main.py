@@ -351,6 +351,7 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
+from open_webui.functions import load_active_pipe_modules
 from open_webui.utils.access_control import has_access
 
 from open_webui.utils.auth import (
@@ -418,6 +419,7 @@ async def lifespan(app: FastAPI):
         get_license_data(app, LICENSE_KEY)
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(load_active_pipe_modules(app))
     yield
 
 
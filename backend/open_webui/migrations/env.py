@@ -69,7 +69,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # Commit each migration on its own, so one that stops the upgrade
+        # (e.g. 1bc6c12c1943 on duplicate emails) keeps the ones before it
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
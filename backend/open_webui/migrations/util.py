@@ -9,6 +9,28 @@ def get_existing_tables():
     return tables
 
 
+def create_index(index_name, table_name, columns, **kw):
+    # On PostgreSQL, build the index without blocking writes to the table;
+    # CONCURRENTLY cannot run inside a transaction, hence the autocommit block
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                index_name, table_name, columns, postgresql_concurrently=True, **kw
+            )
+    else:
+        op.create_index(index_name, table_name, columns, **kw)
+
+
+def drop_index(index_name, table_name, **kw):
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True, **kw
+            )
+    else:
+        op.drop_index(index_name, table_name=table_name, **kw)
+
+
 def get_revision_id():
     import uuid
 
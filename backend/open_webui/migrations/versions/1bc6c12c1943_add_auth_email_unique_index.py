@@ -0,0 +1,49 @@
+"""Add unique auth email index
+
+Revision ID: 1bc6c12c1943
+Revises: c1f3a7e9d2b4
+Create Date: 2025-01-12 08:00:00.000000
+
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import create_index, drop_index
+
+revision = "1bc6c12c1943"
+down_revision = "c1f3a7e9d2b4"
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger(__name__)
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    # Older installs may hold duplicate emails. Picking which account to keep
+    # is not something a migration can decide, so stop with a clear error
+    # rather than leave the database out of step with the model's unique index
+    duplicates = conn.execute(
+        sa.text("SELECT email FROM auth GROUP BY email HAVING COUNT(*) > 1 LIMIT 10")
+    ).all()
+
+    if duplicates:
+        emails = ", ".join(row.email for row in duplicates)
+        log.error(
+            f"Cannot add unique index on 'auth.email'; duplicate emails: {emails}"
+        )
+        raise RuntimeError(
+            "Duplicate emails found in the auth table "
+            f"(e.g. {emails}). Remove or rename the duplicate accounts "
+            "and run the upgrade again."
+        )
+
+    create_index("ix_auth_email", "auth", ["email"], unique=True)
+
+
+def downgrade():
+    drop_index("ix_auth_email", table_name="auth")
@@ -0,0 +1,49 @@
+"""Use JSONB for channel columns on PostgreSQL
+
+Revision ID: 498012b465ab
+Revises: fb0f749e1a52
+Create Date: 2025-01-12 05:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "498012b465ab"
+down_revision = "fb0f749e1a52"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ["data", "meta", "access_control"]
+
+
+def upgrade():
+    # Other dialects have no JSONB; the model falls back to plain JSON there
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for column in COLUMNS:
+        op.alter_column(
+            "channel",
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::jsonb",
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for column in COLUMNS:
+        op.alter_column(
+            "channel",
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f"{column}::json",
+        )
@@ -0,0 +1,40 @@
+"""Add message reaction, message thread and channel member indexes
+
+Revision ID: 4f8af0337775
+Revises: 3781e22d8b01
+Create Date: 2025-01-10 03:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import create_index, drop_index
+
+revision = "4f8af0337775"
+down_revision = "3781e22d8b01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Reactions are always looked up by the message they belong to
+    create_index("ix_message_reaction_message_id", "message_reaction", ["message_id"])
+
+    # Replies are listed and summarised per parent in created_at order
+    create_index(
+        "ix_message_parent_id_created_at", "message", ["parent_id", "created_at"]
+    )
+
+    # Membership checks filter on both the channel and the user
+    create_index(
+        "ix_channel_member_channel_id_user_id",
+        "channel_member",
+        ["channel_id", "user_id"],
+    )
+
+
+def downgrade():
+    drop_index("ix_channel_member_channel_id_user_id", table_name="channel_member")
+    drop_index("ix_message_parent_id_created_at", table_name="message")
+    drop_index("ix_message_reaction_message_id", table_name="message_reaction")
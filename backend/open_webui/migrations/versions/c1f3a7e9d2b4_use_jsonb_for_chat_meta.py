@@ -0,0 +1,64 @@
+"""Use JSONB for chat meta on PostgreSQL
+
+Revision ID: c1f3a7e9d2b4
+Revises: e3748519c2bf
+Create Date: 2025-01-12 07:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from open_webui.migrations.util import create_index, drop_index
+
+revision = "c1f3a7e9d2b4"
+down_revision = "e3748519c2bf"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_chat_meta_tags"
+
+
+def upgrade():
+    # Other dialects have no JSONB; the model falls back to plain JSON there
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # The '{}' default is typed json; drop it so the column type can change
+    op.alter_column("chat", "meta", server_default=None)
+    op.alter_column(
+        "chat",
+        "meta",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="meta::jsonb",
+    )
+    op.alter_column("chat", "meta", server_default="{}")
+
+    # Tag filters probe meta->'tags' with @>, which this index answers
+    create_index(
+        INDEX_NAME,
+        "chat",
+        [sa.text("(meta -> 'tags') jsonb_path_ops")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    drop_index(INDEX_NAME, table_name="chat")
+
+    op.alter_column("chat", "meta", server_default=None)
+    op.alter_column(
+        "chat",
+        "meta",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="meta::json",
+    )
+    op.alter_column("chat", "meta", server_default="{}")
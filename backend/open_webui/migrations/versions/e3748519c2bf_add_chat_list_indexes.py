@@ -0,0 +1,38 @@
+"""Add chat list indexes
+
+Revision ID: e3748519c2bf
+Revises: 498012b465ab
+Create Date: 2025-01-12 06:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import create_index, drop_index
+
+revision = "e3748519c2bf"
+down_revision = "498012b465ab"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Chat lists filter by user and archived state, newest first
+    create_index(
+        "ix_chat_user_id_archived_updated_at",
+        "chat",
+        ["user_id", "archived", "updated_at"],
+    )
+
+    # The sidebar and folder views filter by user and folder, newest first
+    create_index(
+        "ix_chat_user_id_folder_id_updated_at",
+        "chat",
+        ["user_id", "folder_id", "updated_at"],
+    )
+
+
+def downgrade():
+    drop_index("ix_chat_user_id_folder_id_updated_at", table_name="chat")
+    drop_index("ix_chat_user_id_archived_updated_at", table_name="chat")
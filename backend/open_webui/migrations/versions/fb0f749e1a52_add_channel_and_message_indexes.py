@@ -0,0 +1,37 @@
+"""Add channel and message indexes
+
+Revision ID: fb0f749e1a52
+Revises: 4f8af0337775
+Create Date: 2025-01-11 03:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from open_webui.migrations.util import create_index, drop_index
+
+revision = "fb0f749e1a52"
+down_revision = "4f8af0337775"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index("ix_channel_user_id", "channel", ["user_id"])
+    create_index("ix_message_user_id", "message", ["user_id"])
+
+    # Channel timelines and threads filter by channel and parent, newest
+    # first; the leading channel_id also serves plain "messages in channel"
+    # lookups, so no separate channel_id index is needed
+    create_index(
+        "ix_message_channel_id_parent_id_created_at",
+        "message",
+        ["channel_id", "parent_id", "created_at"],
+    )
+
+
+def downgrade():
+    drop_index("ix_message_channel_id_parent_id_created_at", table_name="message")
+    drop_index("ix_message_user_id", table_name="message")
+    drop_index("ix_channel_user_id", table_name="channel")
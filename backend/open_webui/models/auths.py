@@ -3,10 +3,10 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
-from open_webui.models.users import UserModel, Users
+from open_webui.models.users import User, UserModel, Users
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel
-from sqlalchemy import Boolean, Column, String, Text
+from sqlalchemy import Boolean, Column, Index, String, Text, delete, insert, update
 from open_webui.utils.auth import verify_password
 
 log = logging.getLogger(__name__)
@@ -19,6 +19,7 @@ log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 class Auth(Base):
     __tablename__ = "auth"
+    __table_args__ = (Index("ix_auth_email", "email", unique=True),)
 
     id = Column(String, primary_key=True)
     email = Column(String)
@@ -109,20 +110,19 @@ class AuthsTable:
 
             id = str(uuid.uuid4())
 
-            auth = AuthModel(
-                **{"id": id, "email": email, "password": password, "active": True}
+            # Core INSERT: nothing is generated server-side, so there is no
+            # ORM instance to flush or refresh afterwards
+            result = db.execute(
+                insert(Auth).values(id=id, email=email, password=password, active=True)
             )
-            result = Auth(**auth.model_dump())
-            db.add(result)
 
             user = Users.insert_new_user(
                 id, name, email, profile_image_url, role, oauth_sub
             )
 
             db.commit()
-            db.refresh(result)
 
-            if result and user:
+            if result.rowcount == 1 and user:
                 return user
             else:
                 return None
@@ -131,11 +131,17 @@ class AuthsTable:
         log.info(f"authenticate_user: {email}")
         try:
             with get_db() as db:
-                auth = db.query(Auth).filter_by(email=email, active=True).first()
-                if auth:
+                # Fetch the auth row and its user in a single round trip
+                row = (
+                    db.query(Auth, User)
+                    .join(User, User.id == Auth.id)
+                    .filter(Auth.email == email, Auth.active == True)
+                    .first()
+                )
+                if row:
+                    auth, user = row
                     if verify_password(password, auth.password):
-                        user = Users.get_user_by_id(auth.id)
-                        return user
+                        return UserModel.model_validate(user)
                     else:
                         return None
                 else:
@@ -159,46 +165,54 @@ class AuthsTable:
         log.info(f"authenticate_user_by_trusted_header: {email}")
         try:
             with get_db() as db:
-                auth = db.query(Auth).filter_by(email=email, active=True).first()
-                if auth:
-                    user = Users.get_user_by_id(auth.id)
-                    return user
+                user = (
+                    db.query(User)
+                    .join(Auth, Auth.id == User.id)
+                    .filter(Auth.email == email, Auth.active == True)
+                    .first()
+                )
+                if user:
+                    return UserModel.model_validate(user)
         except Exception:
             return None
 
     def update_user_password_by_id(self, id: str, new_password: str) -> bool:
         try:
             with get_db() as db:
-                result = (
-                    db.query(Auth).filter_by(id=id).update({"password": new_password})
+                result = db.execute(
+                    update(Auth).where(Auth.id == id).values(password=new_password)
                 )
                 db.commit()
-                return True if result == 1 else False
+                return True if result.rowcount == 1 else False
         except Exception:
             return False
 
     def update_email_by_id(self, id: str, email: str) -> bool:
         try:
             with get_db() as db:
-                result = db.query(Auth).filter_by(id=id).update({"email": email})
+                result = db.execute(
+                    update(Auth).where(Auth.id == id).values(email=email)
+                )
                 db.commit()
-                return True if result == 1 else False
+                return True if result.rowcount == 1 else False
         except Exception:
             return False
 
     def delete_auth_by_id(self, id: str) -> bool:
         try:
-            with get_db() as db:
-                # Delete User
-                result = Users.delete_user_by_id(id)
-
-                if result:
-                    db.query(Auth).filter_by(id=id).delete()
+            # Delete User
+            result = Users.delete_user_by_id(id)
+
+            if result:
+                # Only check out a session once the user is gone, rather than
+                # holding one open while the user's data is being removed
+                with get_db() as db:
+                    db.execute(delete(Auth).where(Auth.id == id))
                     db.commit()
 
-                    return True
-                else:
-                    return False
+                return True
+            else:
+                return False
         except Exception:
             return False
 
@@ -1,16 +1,21 @@
 import json
 import time
-import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import JSON_VARIANT, Base, get_db
+from open_webui.models.groups import Groups
 from open_webui.utils.access_control import has_access
+from open_webui.utils.misc import uuid7
 
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import BigInteger, Boolean, Column, String, Text
+from sqlalchemy import or_, func, select, and_, text, delete
+from sqlalchemy.orm import raiseload
 from sqlalchemy.sql import exists
 
+# Rows fetched per round trip when streaming channel listings
+CHANNEL_FETCH_BATCH_SIZE = 500
+
 ####################
 # Channel DB Schema
 ####################
@@ -20,15 +25,15 @@ class Channel(Base):
     __tablename__ = "channel"
 
     id = Column(Text, primary_key=True)
-    user_id = Column(Text)
+    user_id = Column(Text, index=True)
     type = Column(Text, nullable=True)
 
     name = Column(Text)
     description = Column(Text, nullable=True)
 
-    data = Column(JSON, nullable=True)
-    meta = Column(JSON, nullable=True)
-    access_control = Column(JSON, nullable=True)
+    data = Column(JSON_VARIANT, nullable=True)
+    meta = Column(JSON_VARIANT, nullable=True)
+    access_control = Column(JSON_VARIANT, nullable=True)
 
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
@@ -52,6 +57,9 @@ class ChannelModel(BaseModel):
     updated_at: int  # timestamp in epoch
 
 
+ChannelModelList = TypeAdapter(list[ChannelModel])
+
+
 ####################
 # Forms
 ####################
@@ -70,50 +78,92 @@ class ChannelTable:
         self, type: Optional[str], form_data: ChannelForm, user_id: str
     ) -> Optional[ChannelModel]:
         with get_db() as db:
-            channel = ChannelModel(
-                **{
-                    **form_data.model_dump(),
-                    "type": type,
-                    "name": form_data.name.lower(),
-                    "id": str(uuid.uuid4()),
-                    "user_id": user_id,
-                    "created_at": int(time.time_ns()),
-                    "updated_at": int(time.time_ns()),
-                }
+            now = time.time_ns()
+            new_channel = Channel(
+                id=str(uuid7()),
+                user_id=user_id,
+                type=type,
+                name=form_data.name.lower(),
+                description=form_data.description,
+                data=form_data.data,
+                meta=form_data.meta,
+                access_control=form_data.access_control,
+                created_at=now,
+                updated_at=now,
             )
 
-            new_channel = Channel(**channel.model_dump())
-
             db.add(new_channel)
             db.commit()
-            return channel
+            return ChannelModel.model_validate(new_channel)
 
-    def get_channels(self) -> list[ChannelModel]:
+    def iter_channels(self, *criteria) -> Iterator[ChannelModel]:
         with get_db() as db:
-            channels = db.query(Channel).all()
-            return [ChannelModel.model_validate(channel) for channel in channels]
+            stmt = (
+                select(Channel)
+                .where(*criteria)
+                # Rows are handed out in batches; any lazy relationship load
+                # here would turn into one query per channel
+                .options(raiseload("*"))
+                .execution_options(yield_per=CHANNEL_FETCH_BATCH_SIZE)
+            )
+            for channels in db.scalars(stmt).partitions():
+                yield from ChannelModelList.validate_python(
+                    channels, from_attributes=True
+                )
+                for channel in channels:
+                    db.expunge(channel)
+
+    def get_channels(self) -> list[ChannelModel]:
+        return list(self.iter_channels())
 
     def get_channels_by_user_id(
         self, user_id: str, permission: str = "read"
     ) -> list[ChannelModel]:
-        channels = self.get_channels()
-        return [
-            channel
-            for channel in channels
-            if channel.user_id == user_id
-            or has_access(user_id, permission, channel.access_control)
+        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user_id)}
+
+        # Narrow the rows in SQL with the same string-based JSON check used
+        # for group membership; has_access below stays the exact check
+        access_control = Channel.access_control.cast(String)
+        conditions = [
+            Channel.user_id == user_id,
+            Channel.access_control.is_(None),
+            access_control == "null",
+            access_control.like(f'%"{user_id}"%'),
         ]
+        conditions.extend(
+            access_control.like(f'%"{group_id}"%') for group_id in user_group_ids
+        )
+
+        # Decide access on the few columns it needs, then load full rows
+        # (with their data/meta blobs) only for the channels that pass
+        with get_db() as db:
+            channel_ids = [
+                id
+                for id, owner_id, channel_access_control in db.execute(
+                    select(Channel.id, Channel.user_id, Channel.access_control).where(
+                        or_(*conditions)
+                    )
+                )
+                if owner_id == user_id
+                or has_access(
+                    user_id, permission, channel_access_control, user_group_ids
+                )
+            ]
+
+        if not channel_ids:
+            return []
+        return list(self.iter_channels(Channel.id.in_(channel_ids)))
 
     def get_channel_by_id(self, id: str) -> Optional[ChannelModel]:
         with get_db() as db:
-            channel = db.query(Channel).filter(Channel.id == id).first()
+            channel = db.get(Channel, id)
             return ChannelModel.model_validate(channel) if channel else None
 
     def update_channel_by_id(
         self, id: str, form_data: ChannelForm
     ) -> Optional[ChannelModel]:
         with get_db() as db:
-            channel = db.query(Channel).filter(Channel.id == id).first()
+            channel = db.get(Channel, id)
             if not channel:
                 return None
 
@@ -121,14 +171,18 @@ class ChannelTable:
             channel.data = form_data.data
             channel.meta = form_data.meta
             channel.access_control = form_data.access_control
-            channel.updated_at = int(time.time_ns())
+            channel.updated_at = time.time_ns()
 
             db.commit()
             return ChannelModel.model_validate(channel) if channel else None
 
     def delete_channel_by_id(self, id: str):
         with get_db() as db:
-            db.query(Channel).filter(Channel.id == id).delete()
+            db.execute(
+                delete(Channel)
+                .where(Channel.id == id)
+                .execution_options(synchronize_session=False)
+            )
             db.commit()
             return True
 
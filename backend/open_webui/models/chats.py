@@ -2,15 +2,30 @@ import logging
 import json
 import time
 import uuid
-from typing import Optional
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Iterator, Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import JSON_VARIANT, Base, engine, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, JSON
+from sqlalchemy import (
+    or_,
+    func,
+    select,
+    and_,
+    text,
+    insert,
+    update,
+    delete,
+    bindparam,
+    literal,
+    not_,
+)
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.sql import exists
 
 ####################
@@ -20,9 +35,20 @@ from sqlalchemy.sql import exists
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
+# Rows fetched per round trip when streaming every chat in the database
+CHAT_FETCH_BATCH_SIZE = 500
+
 
 class Chat(Base):
     __tablename__ = "chat"
+    __table_args__ = (
+        Index(
+            "ix_chat_user_id_archived_updated_at", "user_id", "archived", "updated_at"
+        ),
+        Index(
+            "ix_chat_user_id_folder_id_updated_at", "user_id", "folder_id", "updated_at"
+        ),
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String)
@@ -36,7 +62,8 @@ class Chat(Base):
     archived = Column(Boolean, default=False)
     pinned = Column(Boolean, default=False, nullable=True)
 
-    meta = Column(JSON, server_default="{}")
+    # JSONB on PostgreSQL so tag lookups can use a GIN index
+    meta = Column(JSON_VARIANT, server_default="{}")
     folder_id = Column(Text, nullable=True)
 
 
@@ -59,6 +86,76 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+# Search clauses per dialect, built once instead of on every search
+CHAT_SEARCH_MESSAGES_SQL = {
+    # SQLite case: using JSON1 extension for JSON searching
+    "sqlite": text(
+        """
+        EXISTS (
+            SELECT 1
+            FROM json_each(Chat.chat, '$.messages') AS message
+            WHERE LOWER(message.value->>'content') LIKE '%' || :search_text || '%'
+        )
+        """
+    ),
+    # PostgreSQL relies on proper JSON query for search
+    "postgresql": text(
+        """
+        EXISTS (
+            SELECT 1
+            FROM json_array_elements(Chat.chat->'messages') AS message
+            WHERE LOWER(message->>'content') LIKE '%' || :search_text || '%'
+        )
+        """
+    ),
+}
+
+CHAT_WITHOUT_TAGS_SQL = {
+    "sqlite": text(
+        """
+        NOT EXISTS (
+            SELECT 1
+            FROM json_each(Chat.meta, '$.tags') AS tag
+        )
+        """
+    ),
+    "postgresql": text(
+        """
+        NOT EXISTS (
+            SELECT 1
+            FROM jsonb_array_elements_text(Chat.meta->'tags') AS tag
+        )
+        """
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def get_chat_with_tag_sql(dialect_name: str, tag_idx: int):
+    if dialect_name == "sqlite":
+        return text(
+            f"""
+            EXISTS (
+                SELECT 1
+                FROM json_each(Chat.meta, '$.tags') AS tag
+                WHERE tag.value = :tag_id_{tag_idx}
+            )
+            """
+        )
+    # Containment on meta->'tags' is answered by the ix_chat_meta_tags GIN index
+    return text(
+        f"Chat.meta->'tags' @> jsonb_build_array(CAST(:tag_id_{tag_idx} AS text))"
+    )
+
+
+def _chat_model_from_row(chat: Chat) -> ChatModel:
+    # Chat rows only hold values that were validated before being written;
+    # build their models without running validation a second time
+    return ChatModel.model_construct(
+        **{field: getattr(chat, field) for field in ChatModel.model_fields}
+    )
+
+
 ####################
 # Forms
 ####################
@@ -107,127 +204,250 @@ class ChatTitleIdResponse(BaseModel):
 class ChatTable:
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
-            id = str(uuid.uuid4())
-            chat = ChatModel(
-                **{
-                    "id": id,
-                    "user_id": user_id,
-                    "title": (
-                        form_data.chat["title"]
-                        if "title" in form_data.chat
-                        else "New Chat"
-                    ),
-                    "chat": form_data.chat,
-                    "created_at": int(time.time()),
-                    "updated_at": int(time.time()),
-                }
+            now = int(time.time())
+            result = Chat(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                title=(
+                    form_data.chat["title"] if "title" in form_data.chat else "New Chat"
+                ),
+                chat=form_data.chat,
+                created_at=now,
+                updated_at=now,
+                share_id=None,
+                archived=False,
+                pinned=False,
+                meta={},
+                folder_id=None,
             )
 
-            result = Chat(**chat.model_dump())
             db.add(result)
             db.commit()
-            db.refresh(result)
-            return ChatModel.model_validate(result) if result else None
+            return _chat_model_from_row(result)
 
     def import_chat(
         self, user_id: str, form_data: ChatImportForm
     ) -> Optional[ChatModel]:
         with get_db() as db:
-            id = str(uuid.uuid4())
-            chat = ChatModel(
-                **{
-                    "id": id,
-                    "user_id": user_id,
-                    "title": (
-                        form_data.chat["title"]
-                        if "title" in form_data.chat
-                        else "New Chat"
-                    ),
-                    "chat": form_data.chat,
-                    "meta": form_data.meta,
-                    "pinned": form_data.pinned,
-                    "folder_id": form_data.folder_id,
-                    "created_at": int(time.time()),
-                    "updated_at": int(time.time()),
-                }
+            now = int(time.time())
+            result = Chat(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                title=(
+                    form_data.chat["title"] if "title" in form_data.chat else "New Chat"
+                ),
+                chat=form_data.chat,
+                created_at=now,
+                updated_at=now,
+                share_id=None,
+                archived=False,
+                pinned=form_data.pinned,
+                meta=form_data.meta or {},
+                folder_id=form_data.folder_id,
             )
 
-            result = Chat(**chat.model_dump())
             db.add(result)
             db.commit()
-            db.refresh(result)
-            return ChatModel.model_validate(result) if result else None
+            return _chat_model_from_row(result)
 
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
+        return self._update_chat_values_by_id(
+            id,
+            chat=chat,
+            title=chat["title"] if "title" in chat else "New Chat",
+            updated_at=int(time.time()),
+        )
+
+    def update_chat_title_by_id(self, id: str, title: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = chat
-                chat_item.title = chat["title"] if "title" in chat else "New Chat"
+                if chat_item is None:
+                    return None
+
+                chat_item.chat = {**chat_item.chat, "title": title}
+                chat_item.title = title
                 chat_item.updated_at = int(time.time())
                 db.commit()
-                db.refresh(chat_item)
 
                 return ChatModel.model_validate(chat_item)
         except Exception:
             return None
 
-    def update_chat_title_by_id(self, id: str, title: str) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        chat = chat.chat
-        chat["title"] = title
-
-        return self.update_chat_by_id(id, chat)
-
     def update_chat_tags_by_id(
         self, id: str, tags: list[str], user
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
-        self.delete_all_tags_by_id_and_user_id(id, user.id)
-
-        for tag in chat.meta.get("tags", []):
-            if self.count_chats_by_tag_name_and_user_id(tag, user.id) == 0:
-                Tags.delete_tag_by_name_and_user_id(tag, user.id)
-
+        new_tags = {}
         for tag_name in tags:
             if tag_name.lower() == "none":
                 continue
+            new_tags.setdefault(tag_name.replace(" ", "_").lower(), tag_name)
 
-            self.add_chat_tag_by_id_and_user_id_and_tag_name(id, user.id, tag_name)
-        return self.get_chat_by_id(id)
+        # The chat update and the tag bookkeeping share one session and commit
+        # once at the end; on error nothing is committed and the error
+        # propagates to the caller
+        with get_db() as db:
+            chat_item = db.get(Chat, id)
+            if chat_item is None:
+                return None
+
+            old_tag_ids = set(chat_item.meta.get("tags", []))
+            chat_item.meta = {**chat_item.meta, "tags": list(new_tags)}
+            db.flush()
+
+            # Remove the tags this chat dropped that no other chat still uses
+            dropped_tag_ids = old_tag_ids - new_tags.keys()
+            if dropped_tag_ids:
+                counts = self.count_chats_by_tag_ids_and_user_id(
+                    list(dropped_tag_ids), user.id, db=db
+                )
+                unused_tag_ids = [
+                    tag_id for tag_id in dropped_tag_ids if not counts.get(tag_id)
+                ]
+                if unused_tag_ids:
+                    Tags.delete_tags_by_ids_and_user_id(unused_tag_ids, user.id, db=db)
+
+            if new_tags:
+                existing_tag_ids = {
+                    tag.id
+                    for tag in Tags.get_tags_by_ids_and_user_id(
+                        list(new_tags), user.id, db=db
+                    )
+                }
+                Tags.insert_new_tags(
+                    [
+                        tag_name
+                        for tag_id, tag_name in new_tags.items()
+                        if tag_id not in existing_tag_ids
+                    ],
+                    user.id,
+                    db=db,
+                )
 
-    def get_chat_title_by_id(self, id: str) -> Optional[str]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+            db.commit()
+            return ChatModel.model_validate(chat_item)
 
-        return chat.chat.get("title", "New Chat")
+    def get_chat_title_by_id(self, id: str) -> Optional[str]:
+        # The title column mirrors chat["title"]; read it without the document
+        with get_db() as db:
+            result = db.execute(select(Chat.title).where(Chat.id == id)).first()
+            return result.title if result else None
 
     def get_messages_by_chat_id(self, id: str) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        # Extract history.messages in the database instead of loading and
+        # decoding the whole chat document
+        with get_db() as db:
+            result = db.execute(
+                select(Chat.chat[("history", "messages")]).where(Chat.id == id)
+            ).first()
+            if result is None:
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}) or {}
+            return result[0] or {}
 
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            result = db.execute(
+                select(Chat.chat[("history", "messages", message_id)]).where(
+                    Chat.id == id
+                )
+            ).first()
+            if result is None:
+                return None
+
+            return result[0] or {}
+
+    def _update_chat_json(
+        self, id: str, statement: str, params: dict
+    ) -> Optional[ChatModel]:
+        # Applies an in-place JSON edit to a single chat row; returns None when
+        # the statement matched nothing or the database rejected the document
+        # (e.g. \u0000 in jsonb, NaN in SQLite's json()) so callers can take
+        # the generic path
+        with get_db() as db:
+            try:
+                result = db.execute(
+                    text(statement),
+                    {**params, "id": id, "updated_at": int(time.time())},
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                log.warning(f"In-place JSON update of chat {id} failed: {e}")
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            if not result.rowcount:
+                return None
+
+            chat = db.get(Chat, id)
+            return ChatModel.model_validate(chat) if chat else None
 
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
     ) -> Optional[ChatModel]:
+        # Merge the message into history.messages in the database instead of
+        # reading and rewriting the whole chat document
+        dialect_name = engine.dialect.name
+        if dialect_name == "postgresql":
+            chat = self._update_chat_json(
+                id,
+                """
+                UPDATE chat SET
+                    chat = jsonb_set(
+                        jsonb_set(
+                            chat::jsonb,
+                            ARRAY['history', 'messages', :message_id],
+                            COALESCE(
+                                chat::jsonb #> ARRAY['history', 'messages', :message_id],
+                                '{}'::jsonb
+                            ) || CAST(:message AS jsonb)
+                        ),
+                        '{history,currentId}',
+                        to_jsonb(CAST(:message_id AS text))
+                    )::json,
+                    updated_at = :updated_at
+                WHERE id = :id
+                AND json_typeof(chat->'history'->'messages') = 'object'
+                """,
+                {"message_id": message_id, "message": json.dumps(message)},
+            )
+            if chat:
+                return chat
+        elif dialect_name == "sqlite" and not any(
+            '"' in key for key in [message_id, *message.keys()]
+        ):
+            message_path = f'$.history.messages."{message_id}"'
+            params = {"message_id": message_id, "message_path": message_path}
+
+            assignments = ""
+            for idx, (key, value) in enumerate(message.items()):
+                assignments += f", :key_path_{idx}, json(:value_{idx})"
+                params[f"key_path_{idx}"] = f'{message_path}."{key}"'
+                params[f"value_{idx}"] = json.dumps(value)
+
+            chat = self._update_chat_json(
+                id,
+                f"""
+                UPDATE chat SET
+                    chat = json_set(
+                        json_set(
+                            chat,
+                            :message_path,
+                            json(COALESCE(json_extract(chat, :message_path), '{{}}'))
+                        ){assignments},
+                        '$.history.currentId', :message_id
+                    ),
+                    updated_at = :updated_at
+                WHERE id = :id
+                AND json_type(chat, '$.history.messages') = 'object'
+                """,
+                params,
+            )
+            if chat:
+                return chat
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
@@ -251,6 +471,58 @@ class ChatTable:
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
+        dialect_name = engine.dialect.name
+        if dialect_name == "postgresql":
+            chat = self._update_chat_json(
+                id,
+                """
+                UPDATE chat SET
+                    chat = jsonb_set(
+                        chat::jsonb,
+                        ARRAY['history', 'messages', :message_id, 'statusHistory'],
+                        COALESCE(
+                            chat::jsonb #> ARRAY[
+                                'history', 'messages', :message_id, 'statusHistory'
+                            ],
+                            '[]'::jsonb
+                        ) || jsonb_build_array(CAST(:status AS jsonb))
+                    )::json,
+                    updated_at = :updated_at
+                WHERE id = :id
+                AND json_typeof(chat->'history'->'messages'->:message_id) = 'object'
+                """,
+                {"message_id": message_id, "status": json.dumps(status)},
+            )
+            if chat:
+                return chat
+        elif dialect_name == "sqlite" and '"' not in message_id:
+            message_path = f'$.history.messages."{message_id}"'
+            chat = self._update_chat_json(
+                id,
+                """
+                UPDATE chat SET
+                    chat = json_set(
+                        chat,
+                        :status_path,
+                        json_insert(
+                            COALESCE(json_extract(chat, :status_path), '[]'),
+                            '$[#]',
+                            json(:status)
+                        )
+                    ),
+                    updated_at = :updated_at
+                WHERE id = :id
+                AND json_type(chat, :message_path) = 'object'
+                """,
+                {
+                    "message_path": message_path,
+                    "status_path": f"{message_path}.statusHistory",
+                    "status": json.dumps(status),
+                },
+            )
+            if chat:
+                return chat
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
@@ -284,19 +556,14 @@ class ChatTable:
                     "updated_at": int(time.time()),
                 }
             )
-            shared_result = Chat(**shared_chat.model_dump())
-            db.add(shared_result)
-            db.commit()
-            db.refresh(shared_result)
+            db.execute(insert(Chat).values(**shared_chat.model_dump()))
 
-            # Update the original chat with the share_id
-            result = (
-                db.query(Chat)
-                .filter_by(id=chat_id)
-                .update({"share_id": shared_chat.id})
+            # Update the original chat with the share_id in the same transaction
+            result = db.execute(
+                update(Chat).where(Chat.id == chat_id).values(share_id=shared_chat.id)
             )
             db.commit()
-            return shared_chat if (shared_result and result) else None
+            return shared_chat if result.rowcount else None
 
     def update_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         try:
@@ -330,42 +597,45 @@ class ChatTable:
         except Exception:
             return False
 
-    def update_chat_share_id_by_id(
-        self, id: str, share_id: Optional[str]
+    def _update_chat_values_by_id(
+        self, id: str, *criteria, **values
     ) -> Optional[ChatModel]:
+        # One UPDATE ... RETURNING round trip where the database supports it
+        # (SQLite 3.35+, PostgreSQL), otherwise UPDATE followed by a SELECT.
+        # Extra criteria narrow the match; no row matching returns None
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
-                chat.share_id = share_id
-                db.commit()
-                db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                stmt = update(Chat).where(Chat.id == id, *criteria).values(**values)
+                if engine.dialect.update_returning:
+                    chat = db.execute(stmt.returning(Chat)).scalar_one_or_none()
+                    db.commit()
+                else:
+                    result = db.execute(stmt)
+                    db.commit()
+                    chat = db.get(Chat, id) if result.rowcount else None
+
+                return ChatModel.model_validate(chat) if chat else None
         except Exception:
             return None
 
+    def update_chat_share_id_by_id(
+        self, id: str, share_id: Optional[str]
+    ) -> Optional[ChatModel]:
+        return self._update_chat_values_by_id(id, share_id=share_id)
+
     def toggle_chat_pinned_by_id(self, id: str) -> Optional[ChatModel]:
-        try:
-            with get_db() as db:
-                chat = db.get(Chat, id)
-                chat.pinned = not chat.pinned
-                chat.updated_at = int(time.time())
-                db.commit()
-                db.refresh(chat)
-                return ChatModel.model_validate(chat)
-        except Exception:
-            return None
+        return self._update_chat_values_by_id(
+            id,
+            pinned=not_(func.coalesce(Chat.pinned, False)),
+            updated_at=int(time.time()),
+        )
 
     def toggle_chat_archive_by_id(self, id: str) -> Optional[ChatModel]:
-        try:
-            with get_db() as db:
-                chat = db.get(Chat, id)
-                chat.archived = not chat.archived
-                chat.updated_at = int(time.time())
-                db.commit()
-                db.refresh(chat)
-                return ChatModel.model_validate(chat)
-        except Exception:
-            return None
+        return self._update_chat_values_by_id(
+            id,
+            archived=not_(func.coalesce(Chat.archived, False)),
+            updated_at=int(time.time()),
+        )
 
     def archive_all_chats_by_user_id(self, user_id: str) -> bool:
         try:
@@ -387,7 +657,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_chat_list_by_user_id(
         self,
@@ -409,7 +679,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -420,7 +690,7 @@ class ChatTable:
     ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id).filter_by(folder_id=None)
-            query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
+            query = query.filter(Chat.pinned.isnot(True))
 
             if not include_archived:
                 query = query.filter_by(archived=False)
@@ -436,15 +706,14 @@ class ChatTable:
 
             all_chats = query.all()
 
-            # result has to be destrctured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
+            # result has to be destrctured from sqlalchemy `row` since the `ChatModel` is not the returned dataclass;
+            # the columns come straight from the table, so the models are built without validation
             return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
+                ChatTitleIdResponse.model_construct(
+                    id=chat[0],
+                    title=chat[1],
+                    updated_at=chat[2],
+                    created_at=chat[3],
                 )
                 for chat in all_chats
             ]
@@ -460,7 +729,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
@@ -475,12 +744,14 @@ class ChatTable:
             with get_db() as db:
                 # it is possible that the shared link was deleted. hence,
                 # we check if the chat is still shared by checking if a chat with the share_id exists
-                chat = db.query(Chat).filter_by(share_id=id).first()
-
-                if chat:
-                    return self.get_chat_by_id(id)
-                else:
-                    return None
+                shared_by = aliased(Chat)
+                chat = (
+                    db.query(Chat)
+                    .filter(Chat.id == id)
+                    .filter(exists().where(shared_by.share_id == id))
+                    .first()
+                )
+                return ChatModel.model_validate(chat) if chat else None
         except Exception:
             return None
 
@@ -492,14 +763,20 @@ class ChatTable:
         except Exception:
             return None
 
-    def get_chats(self, skip: int = 0, limit: int = 50) -> list[ChatModel]:
+    def iter_chats(self) -> Iterator[ChatModel]:
         with get_db() as db:
-            all_chats = (
-                db.query(Chat)
-                # .limit(limit).offset(skip)
+            stmt = (
+                select(Chat)
                 .order_by(Chat.updated_at.desc())
+                .execution_options(yield_per=CHAT_FETCH_BATCH_SIZE)
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            for chats in db.scalars(stmt).partitions():
+                for chat in chats:
+                    yield _chat_model_from_row(chat)
+                    db.expunge(chat)
+
+    def get_chats(self, skip: int = 0, limit: int = 50) -> list[ChatModel]:
+        return list(self.iter_chats())
 
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -508,7 +785,7 @@ class ChatTable:
                 .filter_by(user_id=user_id)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -517,7 +794,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -526,7 +803,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -568,107 +845,32 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
-            dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1 
-                                FROM json_each(Chat.chat, '$.messages') AS message 
-                                WHERE LOWER(message.value->>'content') LIKE '%' || :search_text || '%'
-                            )
-                            """
-                        )
-                    ).params(search_text=search_text)
-                )
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
-                            """
-                        )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
+            dialect_name = engine.dialect.name
+            if dialect_name not in CHAT_SEARCH_MESSAGES_SQL:
+                raise NotImplementedError(f"Unsupported dialect: {dialect_name}")
+
+            query = query.filter(
+                (
+                    Chat.title.ilike(
+                        f"%{search_text}%"
+                    )  # Case-insensitive search in title
+                    | CHAT_SEARCH_MESSAGES_SQL[dialect_name]
+                ).params(search_text=search_text)
+            )
 
-            elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(CHAT_WITHOUT_TAGS_SQL[dialect_name])
+            elif tag_ids:
                 query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1
-                                FROM json_array_elements(Chat.chat->'messages') AS message
-                                WHERE LOWER(message->>'content') LIKE '%' || :search_text || '%'
+                    and_(
+                        *[
+                            get_chat_with_tag_sql(dialect_name, tag_idx).params(
+                                **{f"tag_id_{tag_idx}": tag_id}
                             )
-                            """
-                        )
-                    ).params(search_text=search_text)
-                )
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
-                        text(
-                            """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
-                            """
-                        )
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
                     )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
-                        )
-                    )
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
             # Perform pagination at the SQL level
@@ -677,20 +879,20 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str
     ) -> list[ChatModel]:
         with get_db() as db:
             query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
-            query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
+            query = query.filter(Chat.pinned.isnot(True))
             query = query.filter_by(archived=False)
 
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -699,34 +901,36 @@ class ChatTable:
             query = db.query(Chat).filter(
                 Chat.folder_id.in_(folder_ids), Chat.user_id == user_id
             )
-            query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
+            query = query.filter(Chat.pinned.isnot(True))
             query = query.filter_by(archived=False)
 
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
     ) -> Optional[ChatModel]:
-        try:
-            with get_db() as db:
-                chat = db.get(Chat, id)
-                chat.folder_id = folder_id
-                chat.updated_at = int(time.time())
-                chat.pinned = False
-                db.commit()
-                db.refresh(chat)
-                return ChatModel.model_validate(chat)
-        except Exception:
-            return None
+        return self._update_chat_values_by_id(
+            id,
+            Chat.user_id == user_id,
+            folder_id=folder_id,
+            updated_at=int(time.time()),
+            pinned=False,
+        )
 
     def get_chat_tags_by_id_and_user_id(self, id: str, user_id: str) -> list[TagModel]:
         with get_db() as db:
             chat = db.get(Chat, id)
-            tags = chat.meta.get("tags", [])
-            return [Tags.get_tag_by_name_and_user_id(tag, user_id) for tag in tags]
+            tag_ids = chat.meta.get("tags", [])
+
+            # Fetch every tag in one query, then restore the chat's tag order
+            tags = {
+                tag.id: tag
+                for tag in Tags.get_tags_by_ids_and_user_id(tag_ids, user_id, db=db)
+            }
+            return [tags[tag_id] for tag_id in tag_ids if tag_id in tags]
 
     def get_chat_list_by_user_id_and_tag_name(
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
@@ -735,38 +939,38 @@ class ChatTable:
             query = db.query(Chat).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
-            log.info(f"DB dialect name: {db.bind.dialect.name}")
-            if db.bind.dialect.name == "sqlite":
+            log.info(f"DB dialect name: {engine.dialect.name}")
+            if engine.dialect.name == "sqlite":
                 # SQLite JSON1 querying for tags within the meta JSON field
                 query = query.filter(
                     text(
                         f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
                     )
                 ).params(tag_id=tag_id)
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSON query for tags within the meta JSON field (for `json` type)
+            elif engine.dialect.name == "postgresql":
+                # PostgreSQL JSONB containment, served by the GIN index on meta->'tags'
                 query = query.filter(
                     text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
+                        "Chat.meta->'tags' @> jsonb_build_array(CAST(:tag_id AS text))"
                     )
                 ).params(tag_id=tag_id)
             else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
+                raise NotImplementedError(f"Unsupported dialect: {engine.dialect.name}")
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [_chat_model_from_row(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
     ) -> Optional[ChatModel]:
-        tag = Tags.get_tag_by_name_and_user_id(tag_name, user_id)
-        if tag is None:
-            tag = Tags.insert_new_tag(tag_name, user_id)
         try:
+            # The tag lookup/insert and the chat update commit together
             with get_db() as db:
+                tag = Tags.get_tag_by_name_and_user_id(tag_name, user_id, db=db)
+                if tag is None:
+                    tag = Tags.insert_new_tag(tag_name, user_id, db=db)
+
                 chat = db.get(Chat, id)
 
                 tag_id = tag.id
@@ -777,19 +981,56 @@ class ChatTable:
                     }
 
                 db.commit()
-                db.refresh(chat)
                 return ChatModel.model_validate(chat)
         except Exception:
             return None
 
+    def count_chats_by_tag_ids_and_user_id(
+        self, tag_ids: list[str], user_id: str, db: Optional[Session] = None
+    ) -> dict[str, int]:
+        with nullcontext(db) if db else get_db() as db:
+            if engine.dialect.name == "sqlite":
+                query = text(
+                    """
+                    SELECT tag.value, COUNT(*)
+                    FROM chat, json_each(chat.meta, '$.tags') AS tag
+                    WHERE chat.user_id = :user_id AND chat.archived = :archived
+                    AND tag.value IN :tag_ids
+                    GROUP BY tag.value
+                    """
+                )
+            elif engine.dialect.name == "postgresql":
+                query = text(
+                    """
+                    SELECT tag, COUNT(*)
+                    FROM chat, jsonb_array_elements_text(chat.meta->'tags') AS tag
+                    WHERE chat.user_id = :user_id AND chat.archived = :archived
+                    AND tag IN :tag_ids
+                    GROUP BY tag
+                    """
+                )
+            else:
+                raise NotImplementedError(f"Unsupported dialect: {engine.dialect.name}")
+
+            query = query.bindparams(bindparam("tag_ids", expanding=True))
+            return dict(
+                db.execute(
+                    query, {"user_id": user_id, "archived": False, "tag_ids": tag_ids}
+                ).all()
+            )
+
     def count_chats_by_tag_name_and_user_id(self, tag_name: str, user_id: str) -> int:
-        with get_db() as db:  # Assuming `get_db()` returns a session object
-            query = db.query(Chat).filter_by(user_id=user_id, archived=False)
+        with get_db() as db:
+            # Count in the outer query itself; Query.count() would wrap the
+            # whole row select in a subquery
+            query = db.query(func.count(Chat.id)).filter(
+                Chat.user_id == user_id, Chat.archived == False
+            )
 
             # Normalize the tag_name for consistency
             tag_id = tag_name.replace(" ", "_").lower()
 
-            if db.bind.dialect.name == "sqlite":
+            if engine.dialect.name == "sqlite":
                 # SQLite JSON1 support for querying the tags inside the `meta` JSON field
                 query = query.filter(
                     text(
@@ -797,21 +1038,19 @@ class ChatTable:
                     )
                 ).params(tag_id=tag_id)
 
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSONB support for querying the tags inside the `meta` JSON field
+            elif engine.dialect.name == "postgresql":
+                # PostgreSQL JSONB containment, served by the GIN index on meta->'tags'
                 query = query.filter(
                     text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
+                        "Chat.meta->'tags' @> jsonb_build_array(CAST(:tag_id AS text))"
                     )
                 ).params(tag_id=tag_id)
 
             else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
+                raise NotImplementedError(f"Unsupported dialect: {engine.dialect.name}")
 
             # Get the count of matching records
-            count = query.count()
+            count = query.scalar()
 
             # Debugging output for inspection
             log.info(f"Count of chats for tag '{tag_name}': {count}")
@@ -854,20 +1093,38 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(id=id).delete()
+                # The chat and its shared copy (owned by "shared-<chat id>")
+                # go in a single statement
+                db.execute(
+                    delete(Chat)
+                    .where(or_(Chat.id == id, Chat.user_id == f"shared-{id}"))
+                    .execution_options(synchronize_session=False)
+                )
                 db.commit()
 
-                return True and self.delete_shared_chat_by_chat_id(id)
+                return True
         except Exception:
             return False
 
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(id=id, user_id=user_id).delete()
+                # Only drop the shared copy when the user actually owned the
+                # chat, and do both deletes in one transaction
+                result = db.execute(
+                    delete(Chat)
+                    .where(Chat.id == id, Chat.user_id == user_id)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
+                    db.execute(
+                        delete(Chat)
+                        .where(Chat.user_id == f"shared-{id}")
+                        .execution_options(synchronize_session=False)
+                    )
                 db.commit()
 
-                return True and self.delete_shared_chat_by_chat_id(id)
+                return True
         except Exception:
             return False
 
@@ -898,10 +1155,17 @@ class ChatTable:
     def delete_shared_chats_by_user_id(self, user_id: str) -> bool:
         try:
             with get_db() as db:
-                chats_by_user = db.query(Chat).filter_by(user_id=user_id).all()
-                shared_chat_ids = [f"shared-{chat.id}" for chat in chats_by_user]
+                # Shared copies are owned by "shared-<chat id>"; match them with a
+                # subquery instead of loading every chat of the user
+                shared_chat_ids = select(literal("shared-") + Chat.id).where(
+                    Chat.user_id == user_id
+                )
 
-                db.query(Chat).filter(Chat.user_id.in_(shared_chat_ids)).delete()
+                db.execute(
+                    delete(Chat)
+                    .where(Chat.user_id.in_(shared_chat_ids))
+                    .execution_options(synchronize_session=False)
+                )
                 db.commit()
 
                 return True
@@ -146,6 +146,22 @@ class FunctionsTable:
                     for function in db.query(Function).filter_by(type=type).all()
                 ]
 
+    def get_functions_with_valves_by_type(
+        self, type: str, active_only=False
+    ) -> list[tuple[FunctionModel, dict]]:
+        with get_db() as db:
+            query = db.query(Function).filter_by(type=type)
+            if active_only:
+                query = query.filter_by(is_active=True)
+
+            return [
+                (
+                    FunctionModel.model_validate(function),
+                    function.valves if function.valves else {},
+                )
+                for function in query.all()
+            ]
+
     def get_global_filter_functions(self) -> list[FunctionModel]:
         with get_db() as db:
             return [
@@ -1,6 +1,7 @@
 import json
 import time
 import uuid
+from contextlib import nullcontext
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
@@ -8,8 +9,9 @@ from open_webui.models.tags import TagModel, Tag, Tags
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, JSON
 from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.sql import exists
 
 ####################
@@ -21,7 +23,7 @@ class MessageReaction(Base):
     __tablename__ = "message_reaction"
     id = Column(Text, primary_key=True)
     user_id = Column(Text)
-    message_id = Column(Text)
+    message_id = Column(Text, index=True)
     name = Column(Text)
     created_at = Column(BigInteger)
 
@@ -38,9 +40,19 @@ class MessageReactionModel(BaseModel):
 
 class Message(Base):
     __tablename__ = "message"
+    __table_args__ = (
+        Index(
+            "ix_message_channel_id_parent_id_created_at",
+            "channel_id",
+            "parent_id",
+            "created_at",
+        ),
+        Index("ix_message_parent_id_created_at", "parent_id", "created_at"),
+    )
+
     id = Column(Text, primary_key=True)
 
-    user_id = Column(Text)
+    user_id = Column(Text, index=True)
     channel_id = Column(Text, nullable=True)
 
     parent_id = Column(Text, nullable=True)
@@ -124,18 +136,31 @@ class MessageTable:
 
     def get_message_by_id(self, id: str) -> Optional[MessageResponse]:
         with get_db() as db:
-            message = db.get(Message, id)
-            if not message:
+            # Summarise the replies in the same query as the message instead
+            # of loading every reply row
+            reply = aliased(Message)
+            reply_count = (
+                select(func.count()).where(reply.parent_id == id).scalar_subquery()
+            )
+            latest_reply_at = (
+                select(func.max(reply.created_at))
+                .where(reply.parent_id == id)
+                .scalar_subquery()
+            )
+            row = db.execute(
+                select(Message, reply_count, latest_reply_at).where(Message.id == id)
+            ).one_or_none()
+            if not row:
                 return None
 
-            reactions = self.get_reactions_by_message_id(id)
-            replies = self.get_replies_by_message_id(id)
+            message, reply_count, latest_reply_at = row
+            reactions = self.get_reactions_by_message_id(id, db=db)
 
             return MessageResponse(
                 **{
                     **MessageModel.model_validate(message).model_dump(),
-                    "latest_reply_at": replies[0].created_at if replies else None,
-                    "reply_count": len(replies),
+                    "latest_reply_at": latest_reply_at,
+                    "reply_count": reply_count,
                     "reactions": reactions,
                 }
             )
@@ -226,22 +251,54 @@ class MessageTable:
             db.refresh(result)
             return MessageReactionModel.model_validate(result) if result else None
 
-    def get_reactions_by_message_id(self, id: str) -> list[Reactions]:
-        with get_db() as db:
-            all_reactions = db.query(MessageReaction).filter_by(message_id=id).all()
-
-            reactions = {}
-            for reaction in all_reactions:
-                if reaction.name not in reactions:
-                    reactions[reaction.name] = {
-                        "name": reaction.name,
-                        "user_ids": [],
-                        "count": 0,
-                    }
-                reactions[reaction.name]["user_ids"].append(reaction.user_id)
-                reactions[reaction.name]["count"] += 1
-
-            return [Reactions(**reaction) for reaction in reactions.values()]
+    def get_reactions_by_message_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> list[Reactions]:
+        with nullcontext(db) if db else get_db() as db:
+            # Group by reaction name in the database where the aggregate is
+            # available: one row per reaction rather than one per user
+            if db.bind.dialect.name == "postgresql":
+                user_ids = func.array_agg(MessageReaction.user_id)
+            elif db.bind.dialect.name == "sqlite":
+                user_ids = func.json_group_array(MessageReaction.user_id)
+            else:
+                all_reactions = (
+                    db.query(MessageReaction)
+                    .filter_by(message_id=id)
+                    .order_by(MessageReaction.created_at)
+                    .all()
+                )
+
+                reactions = {}
+                for reaction in all_reactions:
+                    if reaction.name not in reactions:
+                        reactions[reaction.name] = {
+                            "name": reaction.name,
+                            "user_ids": [],
+                            "count": 0,
+                        }
+                    reactions[reaction.name]["user_ids"].append(reaction.user_id)
+                    reactions[reaction.name]["count"] += 1
+
+                return [Reactions(**reaction) for reaction in reactions.values()]
+
+            rows = db.execute(
+                select(MessageReaction.name, user_ids, func.count())
+                .where(MessageReaction.message_id == id)
+                .group_by(MessageReaction.name)
+                .order_by(func.min(MessageReaction.created_at))
+            ).all()
+
+            return [
+                Reactions(
+                    name=name,
+                    user_ids=(
+                        json.loads(user_ids) if isinstance(user_ids, str) else user_ids
+                    ),
+                    count=count,
+                )
+                for name, user_ids, count in rows
+            ]
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str
@@ -1,6 +1,7 @@
 import logging
 import time
 import uuid
+from contextlib import nullcontext
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
@@ -8,7 +9,8 @@ from open_webui.internal.db import Base, get_db
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, JSON, PrimaryKeyConstraint
+from sqlalchemy import BigInteger, Column, String, JSON, PrimaryKeyConstraint, insert
+from sqlalchemy.orm import Session
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -47,32 +49,64 @@ class TagChatIdForm(BaseModel):
 
 
 class TagTable:
-    def insert_new_tag(self, name: str, user_id: str) -> Optional[TagModel]:
-        with get_db() as db:
+    def insert_new_tag(
+        self, name: str, user_id: str, db: Optional[Session] = None
+    ) -> Optional[TagModel]:
+        # A caller-supplied session owns the transaction: only flush into it,
+        # and leave errors to the caller, who has to roll it back
+        with nullcontext(db) if db else get_db() as session:
             id = name.replace(" ", "_").lower()
             tag = TagModel(**{"id": id, "user_id": user_id, "name": name})
             try:
                 result = Tag(**tag.model_dump())
-                db.add(result)
-                db.commit()
-                db.refresh(result)
+                session.add(result)
+                if db is None:
+                    session.commit()
+                else:
+                    session.flush()
                 if result:
                     return TagModel.model_validate(result)
                 else:
                     return None
             except Exception as e:
+                if db is not None:
+                    raise
                 log.exception(f"Error inserting a new tag: {e}")
                 return None
 
+    def insert_new_tags(
+        self, names: list[str], user_id: str, db: Optional[Session] = None
+    ) -> list[TagModel]:
+        tags = [
+            TagModel(id=name.replace(" ", "_").lower(), user_id=user_id, name=name)
+            for name in names
+        ]
+        if not tags:
+            return []
+
+        with nullcontext(db) if db else get_db() as session:
+            try:
+                session.execute(insert(Tag), [tag.model_dump() for tag in tags])
+                if db is None:
+                    session.commit()
+                return tags
+            except Exception as e:
+                if db is not None:
+                    raise
+                log.exception(f"Error inserting new tags: {e}")
+                return []
+
     def get_tag_by_name_and_user_id(
-        self, name: str, user_id: str
+        self, name: str, user_id: str, db: Optional[Session] = None
     ) -> Optional[TagModel]:
         try:
             id = name.replace(" ", "_").lower()
-            with get_db() as db:
-                tag = db.query(Tag).filter_by(id=id, user_id=user_id).first()
-                return TagModel.model_validate(tag)
+            with nullcontext(db) if db else get_db() as session:
+                tag = session.query(Tag).filter_by(id=id, user_id=user_id).first()
+                return TagModel.model_validate(tag) if tag else None
         except Exception:
+            if db is not None:
+                raise
             return None
 
     def get_tags_by_user_id(self, user_id: str) -> list[TagModel]:
@@ -83,9 +117,9 @@ class TagTable:
             ]
 
     def get_tags_by_ids_and_user_id(
-        self, ids: list[str], user_id: str
+        self, ids: list[str], user_id: str, db: Optional[Session] = None
     ) -> list[TagModel]:
-        with get_db() as db:
+        with nullcontext(db) if db else get_db() as db:
             return [
                 TagModel.model_validate(tag)
                 for tag in (
@@ -105,5 +139,22 @@ class TagTable:
             log.error(f"delete_tag: {e}")
             return False
 
+    def delete_tags_by_ids_and_user_id(
+        self, ids: list[str], user_id: str, db: Optional[Session] = None
+    ) -> bool:
+        try:
+            with nullcontext(db) if db else get_db() as session:
+                session.query(Tag).filter(
+                    Tag.id.in_(ids), Tag.user_id == user_id
+                ).delete()
+                if db is None:
+                    session.commit()
+                return True
+        except Exception as e:
+            if db is not None:
+                raise
+            log.error(f"delete_tags: {e}")
+            return False
+
 
 Tags = TagTable()
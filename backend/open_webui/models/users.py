@@ -121,7 +121,6 @@ class UsersTable:
             result = User(**user.model_dump())
             db.add(result)
             db.commit()
-            db.refresh(result)
             if result:
                 return user
             else:
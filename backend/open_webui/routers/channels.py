@@ -3,14 +3,28 @@ import logging
 from typing import Optional
 
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+    BackgroundTasks,
+)
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 
 from open_webui.socket.main import sio, get_user_ids_from_room
 from open_webui.models.users import Users, UserNameResponse
 
-from open_webui.models.channels import Channels, ChannelModel, ChannelForm
+from open_webui.models.channels import (
+    Channels,
+    ChannelModel,
+    ChannelModelList,
+    ChannelForm,
+)
 from open_webui.models.messages import (
     Messages,
     MessageModel,
@@ -41,9 +55,16 @@ router = APIRouter()
 @router.get("/", response_model=list[ChannelModel])
 async def get_channels(user=Depends(get_verified_user)):
     if user.role == "admin":
-        return Channels.get_channels()
+        channels = await run_in_threadpool(Channels.get_channels)
     else:
-        return Channels.get_channels_by_user_id(user.id)
+        channels = await run_in_threadpool(Channels.get_channels_by_user_id, user.id)
+
+    # The models are already validated; serialize them in one pass instead of
+    # letting the response_model validate and encode every channel again
+    return Response(
+        content=ChannelModelList.dump_json(channels),
+        media_type="application/json",
+    )
 
 
 ############################
@@ -18,6 +18,7 @@ from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 
@@ -257,7 +258,35 @@ async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats()]
+
+    # Stream the export as a JSON array so memory stays bounded by the
+    # fetch batch rather than the whole chat table. The first row is read
+    # before the response starts, so a failing query still returns an error
+    # status instead of a 200
+    chats = Chats.iter_chats()
+    first_chat = next(chats, None)
+
+    def serialize(chat) -> str:
+        return ChatResponse.model_validate(chat.model_dump()).model_dump_json()
+
+    def generate():
+        try:
+            yield "["
+            if first_chat is not None:
+                yield serialize(first_chat)
+                for chat in chats:
+                    yield "," + serialize(chat)
+            yield "]"
+        except Exception as e:
+            # The status line has already been sent; re-raising makes the
+            # server abort the connection, so clients see an incomplete
+            # transfer rather than a well-formed but truncated array
+            log.exception(f"Chat export failed partway through: {e}")
+            raise
+        finally:
+            chats.close()
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 ############################
@@ -0,0 +1,105 @@
+from test.util.abstract_integration_test import AbstractPostgresTest
+from test.util.mock_user import mock_webui_user
+
+
+def _access_control(read_user_ids=None, read_group_ids=None, write_user_ids=None):
+    return {
+        "read": {"user_ids": read_user_ids or [], "group_ids": read_group_ids or []},
+        "write": {"user_ids": write_user_ids or [], "group_ids": []},
+    }
+
+
+class TestChannels(AbstractPostgresTest):
+    BASE_PATH = "/api/v1/channels"
+
+    def setup_class(cls):
+        super().setup_class()
+
+    def setup_method(self):
+        super().setup_method()
+        from open_webui.models.channels import ChannelForm, Channels
+        from open_webui.models.groups import GroupForm, GroupUpdateForm, Groups
+
+        self.channels = Channels
+        group = Groups.insert_new_group(
+            "1", GroupForm(name="group1", description="group1 description")
+        )
+        Groups.update_group_by_id(
+            group.id,
+            GroupUpdateForm(
+                name="group1", description="group1 description", user_ids=["2"]
+            ),
+        )
+
+        def insert_channel(name, user_id, access_control):
+            return Channels.insert_new_channel(
+                None,
+                ChannelForm(name=name, access_control=access_control),
+                user_id,
+            )
+
+        insert_channel("owned", "1", _access_control())
+        insert_channel("public", "1", None)
+        insert_channel("shared-user", "1", _access_control(read_user_ids=["2"]))
+        insert_channel("shared-group", "1", _access_control(read_group_ids=[group.id]))
+        insert_channel("similar-id", "1", _access_control(read_user_ids=["22"]))
+        insert_channel("write-only", "1", _access_control(write_user_ids=["2"]))
+
+    def test_get_channels_by_user_id(self):
+        channels = self.channels.get_channels_by_user_id("2")
+        assert {channel.name for channel in channels} == {
+            "public",
+            "shared-user",
+            "shared-group",
+        }
+
+        channels = self.channels.get_channels_by_user_id("2", permission="write")
+        assert {channel.name for channel in channels} == {"write-only"}
+
+        channels = self.channels.get_channels_by_user_id("1")
+        assert {channel.name for channel in channels} == {
+            "owned",
+            "public",
+            "shared-user",
+            "shared-group",
+            "similar-id",
+            "write-only",
+        }
+
+        channels = self.channels.get_channels_by_user_id("3")
+        assert {channel.name for channel in channels} == {"public"}
+
+    def test_get_channels(self):
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.get(self.create_url("/"))
+        assert response.status_code == 200
+        data = response.json()
+        assert {channel["name"] for channel in data} == {
+            "public",
+            "shared-user",
+            "shared-group",
+        }
+        for channel in data:
+            assert channel["id"] is not None
+            assert channel["user_id"] == "1"
+            assert channel["created_at"] is not None
+
+    def test_get_reactions_by_message_id(self):
+        from open_webui.models.messages import MessageForm, Messages
+
+        channel = self.channels.get_channels_by_user_id("1")[0]
+        message = Messages.insert_new_message(
+            MessageForm(content="hello"), channel.id, "1"
+        )
+        assert Messages.get_reactions_by_message_id(message.id) == []
+
+        Messages.add_reaction_to_message(message.id, "1", "thumbsup")
+        Messages.add_reaction_to_message(message.id, "2", "heart")
+        Messages.add_reaction_to_message(message.id, "2", "thumbsup")
+
+        # One entry per reaction name, ordered by its first use
+        reactions = Messages.get_reactions_by_message_id(message.id)
+        assert [reaction.name for reaction in reactions] == ["thumbsup", "heart"]
+        assert [reaction.count for reaction in reactions] == [2, 1]
+        assert sorted(reactions[0].user_ids) == ["1", "2"]
+        assert reactions[1].user_ids == ["2"]
@@ -1,4 +1,5 @@
 import uuid
+from types import SimpleNamespace
 
 from test.util.abstract_integration_test import AbstractPostgresTest
 from test.util.mock_user import mock_webui_user
@@ -234,3 +235,234 @@ class TestChats(AbstractPostgresTest):
 
         chat = self.chats.get_chat_by_id(chat_id)
         assert chat.share_id is None
+
+    def insert_chat_with_messages(self):
+        from open_webui.models.chats import ChatForm
+
+        return self.chats.insert_new_chat(
+            "2",
+            ChatForm(
+                **{
+                    "chat": {
+                        "name": "chat2",
+                        "history": {
+                            "currentId": "m1",
+                            "messages": {
+                                "m1": {"id": "m1", "role": "user", "content": "hi"}
+                            },
+                        },
+                    }
+                }
+            ),
+        )
+
+    def test_upsert_message_merges_existing_message(self):
+        chat_id = self.insert_chat_with_messages().id
+
+        chat = self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat_id, "m1", {"content": "hello", "done": True}
+        )
+        assert chat is not None
+        assert chat.chat["history"]["messages"]["m1"] == {
+            "id": "m1",
+            "role": "user",
+            "content": "hello",
+            "done": True,
+        }
+        assert chat.chat["history"]["currentId"] == "m1"
+        assert self.chats.get_message_by_id_and_message_id(chat_id, "m1") == {
+            "id": "m1",
+            "role": "user",
+            "content": "hello",
+            "done": True,
+        }
+
+    def test_upsert_message_inserts_new_message(self):
+        chat_id = self.insert_chat_with_messages().id
+
+        chat = self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat_id, "m2", {"id": "m2", "role": "assistant", "content": "hey"}
+        )
+        assert chat is not None
+        assert chat.chat["history"]["currentId"] == "m2"
+        assert self.chats.get_messages_by_chat_id(chat_id) == {
+            "m1": {"id": "m1", "role": "user", "content": "hi"},
+            "m2": {"id": "m2", "role": "assistant", "content": "hey"},
+        }
+
+    def test_add_message_status_appends_to_status_history(self):
+        chat_id = self.insert_chat_with_messages().id
+
+        self.chats.add_message_status_to_chat_by_id_and_message_id(
+            chat_id, "m1", {"action": "web_search", "done": False}
+        )
+        chat = self.chats.add_message_status_to_chat_by_id_and_message_id(
+            chat_id, "m1", {"action": "web_search", "done": True}
+        )
+        assert chat is not None
+        assert chat.chat["history"]["messages"]["m1"]["statusHistory"] == [
+            {"action": "web_search", "done": False},
+            {"action": "web_search", "done": True},
+        ]
+
+    def test_upsert_message_falls_back_when_database_rejects_json(self):
+        chat_id = self.insert_chat_with_messages().id
+
+        # jsonb cannot hold \u0000, so the in-place update fails on PostgreSQL
+        chat = self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat_id, "m1", {"content": "a\u0000b"}
+        )
+        assert chat is not None
+        assert chat.chat["history"]["messages"]["m1"]["content"] == "a\u0000b"
+
+    def test_message_updates_on_missing_message(self):
+        chat_id = self.insert_chat_with_messages().id
+
+        chat = self.chats.add_message_status_to_chat_by_id_and_message_id(
+            chat_id, "missing", {"action": "web_search", "done": True}
+        )
+        assert chat is not None
+        assert "missing" not in chat.chat["history"]["messages"]
+        assert self.chats.get_message_by_id_and_message_id(chat_id, "missing") == {}
+
+        assert (
+            self.chats.upsert_message_to_chat_by_id_and_message_id(
+                "missing", "m1", {"content": "hello"}
+            )
+            is None
+        )
+        assert (
+            self.chats.add_message_status_to_chat_by_id_and_message_id(
+                "missing", "m1", {"action": "web_search", "done": True}
+            )
+            is None
+        )
+        assert self.chats.get_messages_by_chat_id("missing") is None
+
+    def test_update_chat_tags_by_id(self):
+        from open_webui.models.chats import ChatForm
+        from open_webui.models.tags import Tags
+
+        user = SimpleNamespace(id="2")
+        chat_id = self.chats.get_chats()[0].id
+        other_chat_id = self.chats.insert_new_chat(
+            "2", ChatForm(**{"chat": {"name": "chat2"}})
+        ).id
+
+        chat = self.chats.update_chat_tags_by_id(
+            chat_id, ["Work", "Side Project", "None"], user
+        )
+        assert chat.meta["tags"] == ["work", "side_project"]
+        assert {tag.id for tag in Tags.get_tags_by_user_id("2")} == {
+            "work",
+            "side_project",
+        }
+
+        self.chats.update_chat_tags_by_id(other_chat_id, ["Work"], user)
+
+        # Dropped tags are deleted only once no other chat uses them
+        chat = self.chats.update_chat_tags_by_id(chat_id, ["Home"], user)
+        assert chat.meta["tags"] == ["home"]
+        assert {tag.id for tag in Tags.get_tags_by_user_id("2")} == {"work", "home"}
+
+        assert self.chats.update_chat_tags_by_id("missing", ["Work"], user) is None
+
+    def test_add_and_delete_chat_tag_by_id(self):
+        from open_webui.models.tags import Tags
+
+        chat_id = self.chats.get_chats()[0].id
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.post(
+                self.create_url(f"/{chat_id}/tags"), json={"name": "Side Project"}
+            )
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": "side_project", "name": "Side Project", "user_id": "2", "meta": None}
+        ]
+
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.request(
+                "DELETE",
+                self.create_url(f"/{chat_id}/tags"),
+                json={"name": "Side Project"},
+            )
+        assert response.status_code == 200
+        assert response.json() == []
+        assert self.chats.get_chat_by_id(chat_id).meta["tags"] == []
+        assert Tags.get_tags_by_user_id("2") == []
+
+    def test_pin_chat_by_id(self):
+        chat_id = self.chats.get_chats()[0].id
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.post(self.create_url(f"/{chat_id}/pin"))
+        assert response.status_code == 200
+        assert response.json()["pinned"] is True
+
+        chat = self.chats.toggle_chat_pinned_by_id(chat_id)
+        assert chat.pinned is False
+        assert self.chats.get_chat_by_id(chat_id).pinned is False
+
+    def test_toggle_chat_archive_by_id(self):
+        chat_id = self.chats.get_chats()[0].id
+
+        chat = self.chats.toggle_chat_archive_by_id(chat_id)
+        assert chat.archived is True
+        chat = self.chats.toggle_chat_archive_by_id(chat_id)
+        assert chat.archived is False
+
+        assert self.chats.toggle_chat_archive_by_id("missing") is None
+        assert self.chats.toggle_chat_pinned_by_id("missing") is None
+        assert self.chats.update_chat_share_id_by_id("missing", "share") is None
+
+    def test_update_chat_by_id_returns_updated_row(self):
+        chat = self.chats.get_chats()[0]
+
+        updated = self.chats.update_chat_by_id(
+            chat.id, {**chat.chat, "title": "Renamed"}
+        )
+        assert updated.title == "Renamed"
+        assert updated.chat["title"] == "Renamed"
+        assert updated.updated_at >= chat.updated_at
+        assert self.chats.get_chat_by_id(chat.id).title == "Renamed"
+
+        assert self.chats.update_chat_by_id("missing", {"title": "Renamed"}) is None
+
+    def test_update_chat_folder_id_by_id(self):
+        chat_id = self.chats.get_chats()[0].id
+        self.chats.toggle_chat_pinned_by_id(chat_id)
+
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.post(
+                self.create_url(f"/{chat_id}/folder"), json={"folder_id": "folder1"}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["folder_id"] == "folder1"
+        assert data["pinned"] is False
+
+        # Another user's chat is left untouched
+        assert (
+            self.chats.update_chat_folder_id_by_id_and_user_id(chat_id, "3", "folder2")
+            is None
+        )
+        assert self.chats.get_chat_by_id(chat_id).folder_id == "folder1"
+
+    def test_get_all_user_chats_in_db_streams_chat_responses(self):
+        from open_webui.models.chats import ChatForm, ChatResponse
+
+        self.chats.insert_new_chat("3", ChatForm(**{"chat": {"name": "chat2"}}))
+        with mock_webui_user(id="4", role="admin"):
+            response = self.fast_api_client.get(self.create_url("/all/db"))
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert {chat["user_id"] for chat in data} == {"2", "3"}
+        for chat in data:
+            assert set(chat) == set(ChatResponse.model_fields)
+
+        self.chats.delete_chats_by_user_id("2")
+        self.chats.delete_chats_by_user_id("3")
+        with mock_webui_user(id="4", role="admin"):
+            response = self.fast_api_client.get(self.create_url("/all/db"))
+        assert response.status_code == 200
+        assert response.json() == []
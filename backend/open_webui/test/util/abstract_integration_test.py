@@ -147,10 +147,14 @@ class AbstractPostgresTest(AbstractIntegrationTest):
         # truncate all tables
         tables = [
             "auth",
+            "channel",
             "chat",
             "chatidtag",
             "document",
+            '"group"',
             "memory",
+            "message",
+            "message_reaction",
             "model",
             "prompt",
             "tag",